@@ -1,42 +1,29 @@
 import os
-import json
-from fastapi import FastAPI, Depends, HTTPException, Query, Request, Form
+import re
+import orjson
+from functools import lru_cache
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
-
-try:
-    from slack_sdk import WebClient
-    from slack_sdk.errors import SlackApiError
-    SLACK_AVAILABLE = True
-except ImportError:
-    SLACK_AVAILABLE = False
-    WebClient = None
-
-from app.database import get_db, init_db
-from app.schemas import ActivityResponse, ActivityCreate, ActivityUpdate
+from typing import List, Optional, Union
+from urllib.parse import parse_qs
+
+from app.database import get_db, get_session_local, init_db
+from app.schemas import ActivityResponse, ActivityListResponse, ActivityCreate, ActivityUpdate
 from app import crud
 from app.utils import import_csv_to_db
-from app.slack_handlers import (
-    handle_gtm_help,
-    handle_gtm_list,
-    handle_gtm_view,
-    handle_gtm_add,
-    handle_gtm_update
-)
-from app.slack_utils import (
-    create_update_modal,
-    parse_modal_submission,
-    format_activity_for_slack,
-    post_new_activity_notification
-)
+
+# Slack modules (and slack_sdk) are imported lazily inside the Slack code paths
+# so cold starts for the REST endpoints don't pay for them.
 
 # Initialize FastAPI app
 app = FastAPI(
     title="GTM Tracker API",
     description="REST API for tracking GTM (Go-To-Market) activities",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -53,58 +40,82 @@ app.add_middleware(
 # async def startup_event():
 #     pass
 
+def dumps(content) -> bytes:
+    """
+    Encode content with orjson. UTC datetimes get a "Z" suffix, matching
+    what Pydantic produces for the response models.
+    """
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+# Root and health payloads only depend on the environment, which is fixed for
+# the life of the process, so serialize them once at import time.
+_db_url = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL") or os.getenv("POSTGRES_URL_NO_SSL")
+
+_ROOT_BYTES = dumps({
+    "message": "GTM Tracker API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "database_configured": bool(_db_url),
+    "slack_configured": bool(os.getenv("SLACK_BOT_TOKEN")),
+    "endpoints": {
+        "list_activities": "GET /api/activities",
+        "stream_activities": "GET /api/activities.ndjson",
+        "get_activity": "GET /api/activities/{id}",
+        "create_activity": "POST /api/activities",
+        "update_activity": "PUT /api/activities/{id}",
+        "patch_activity": "PATCH /api/activities/{id}",
+        "delete_activity": "DELETE /api/activities/{id}",
+        "import_csv": "POST /api/import-csv"
+    }
+})
+
+_HEALTH_BYTES = dumps({
+    "status": "healthy",
+    "env_check": {
+        "DATABASE_URL": "set" if _db_url else "missing",
+        "SLACK_BOT_TOKEN": "set" if os.getenv("SLACK_BOT_TOKEN") else "missing"
+    }
+})
+
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    try:
-        db_url = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL") or os.getenv("POSTGRES_URL_NO_SSL")
-        return {
-            "message": "GTM Tracker API",
-            "version": "1.0.0",
-            "docs": "/docs",
-            "database_configured": bool(db_url),
-            "slack_configured": bool(os.getenv("SLACK_BOT_TOKEN")),
-            "endpoints": {
-                "list_activities": "GET /api/activities",
-                "get_activity": "GET /api/activities/{id}",
-                "create_activity": "POST /api/activities",
-                "update_activity": "PUT /api/activities/{id}",
-                "patch_activity": "PATCH /api/activities/{id}",
-                "delete_activity": "DELETE /api/activities/{id}",
-                "import_csv": "POST /api/import-csv"
-            }
-        }
-    except Exception as e:
-        return {"error": str(e), "type": str(type(e))}
+    # A new Response per request: middleware (CORS) mutates response headers
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    try:
-        db_url = os.getenv("DATABASE_URL") or os.getenv("POSTGRES_URL") or os.getenv("POSTGRES_URL_NO_SSL")
-        return {
-            "status": "healthy",
-            "env_check": {
-                "DATABASE_URL": "set" if db_url else "missing",
-                "SLACK_BOT_TOKEN": "set" if os.getenv("SLACK_BOT_TOKEN") else "missing"
-            }
-        }
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 # List all activities
-@app.get("/api/activities", response_model=List[ActivityResponse])
-async def list_activities(
+@app.get("/api/activities", response_model=Union[List[ActivityResponse], ActivityListResponse])
+def list_activities(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
     hypothesis: Optional[str] = Query(None, description="Filter by hypothesis (case-insensitive partial match)"),
     audience: Optional[str] = Query(None, description="Filter by audience (case-insensitive partial match)"),
     channels: Optional[str] = Query(None, description="Filter by channels (case-insensitive partial match)"),
+    with_count: bool = Query(False, description="Return {items, total} including the total number of matching records"),
     db: Session = Depends(get_db)
 ):
     """Get list of activities with optional filters"""
+    if with_count:
+        items, total = crud.get_activities_with_count(
+            db,
+            skip=skip,
+            limit=limit,
+            hypothesis=hypothesis,
+            audience=audience,
+            channels=channels
+        )
+        return Response(
+            content=dumps({"items": [item.to_dict() for item in items], "total": total}),
+            media_type="application/json"
+        )
+
     activities = crud.get_activities(
         db,
         skip=skip,
@@ -113,11 +124,44 @@ async def list_activities(
         audience=audience,
         channels=channels
     )
-    return activities
+    # Encode rows directly; returning a Response skips response_model
+    # validation, which is the main per-row cost for large pages
+    return Response(
+        content=dumps([activity.to_dict() for activity in activities]),
+        media_type="application/json"
+    )
+
+# Stream activities as NDJSON
+@app.get("/api/activities.ndjson")
+def stream_activities(
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of records to return (default: all)"),
+    hypothesis: Optional[str] = Query(None, description="Filter by hypothesis (case-insensitive partial match)"),
+    audience: Optional[str] = Query(None, description="Filter by audience (case-insensitive partial match)"),
+    channels: Optional[str] = Query(None, description="Filter by channels (case-insensitive partial match)")
+):
+    """Stream activities as newline-delimited JSON, one activity per line"""
+    def generate():
+        # Own session: the request-scoped one is closed before streaming starts
+        db = get_session_local()()
+        try:
+            for row in crud.iter_activity_rows(
+                db,
+                skip=skip,
+                limit=limit,
+                hypothesis=hypothesis,
+                audience=audience,
+                channels=channels
+            ):
+                yield dumps(row) + b"\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 # Get single activity
 @app.get("/api/activities/{activity_id}", response_model=ActivityResponse)
-async def get_activity(activity_id: int, db: Session = Depends(get_db)):
+def get_activity(activity_id: int, db: Session = Depends(get_db)):
     """Get a single activity by ID"""
     activity = crud.get_activity(db, activity_id)
     if not activity:
@@ -126,19 +170,26 @@ async def get_activity(activity_id: int, db: Session = Depends(get_db)):
 
 # Create new activity
 @app.post("/api/activities", response_model=ActivityResponse, status_code=201)
-async def create_activity(activity: ActivityCreate, db: Session = Depends(get_db)):
+def create_activity(
+    activity: ActivityCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Create a new activity"""
     new_activity = crud.create_activity(db, activity)
 
-    # Post notification to Slack
+    # Post notification to Slack after the response is sent, so the
+    # Slack API round-trip isn't part of the request latency
+    slack_client = get_slack_client()
     if slack_client:
-        post_new_activity_notification(new_activity, slack_client)
+        from app.slack_utils import post_new_activity_notification
+        background_tasks.add_task(post_new_activity_notification, new_activity, slack_client)
 
     return new_activity
 
 # Update activity (full update)
 @app.put("/api/activities/{activity_id}", response_model=ActivityResponse)
-async def update_activity(
+def update_activity(
     activity_id: int,
     activity: ActivityCreate,
     db: Session = Depends(get_db)
@@ -153,7 +204,7 @@ async def update_activity(
 
 # Partial update activity
 @app.patch("/api/activities/{activity_id}", response_model=ActivityResponse)
-async def patch_activity(
+def patch_activity(
     activity_id: int,
     activity: ActivityUpdate,
     db: Session = Depends(get_db)
@@ -166,7 +217,7 @@ async def patch_activity(
 
 # Delete activity
 @app.delete("/api/activities/{activity_id}", status_code=204)
-async def delete_activity(activity_id: int, db: Session = Depends(get_db)):
+def delete_activity(activity_id: int, db: Session = Depends(get_db)):
     """Delete an activity"""
     deleted = crud.delete_activity(db, activity_id)
     if not deleted:
@@ -175,7 +226,7 @@ async def delete_activity(activity_id: int, db: Session = Depends(get_db)):
 
 # Import CSV
 @app.post("/api/import-csv")
-async def import_csv(db: Session = Depends(get_db)):
+def import_csv(db: Session = Depends(get_db)):
     """Import activities from CSV file"""
     csv_path = os.path.join(os.path.dirname(__file__), "..", "data", "activities.csv")
     if not os.path.exists(csv_path):
@@ -195,84 +246,210 @@ async def import_csv(db: Session = Depends(get_db)):
 # SLACK INTEGRATION ENDPOINTS
 # ============================================================================
 
-# Initialize Slack client
-slack_bot_token = os.getenv("SLACK_BOT_TOKEN")
-slack_client = WebClient(token=slack_bot_token) if (slack_bot_token and WebClient) else None
+def get_slack_client():
+    """Get the shared Slack WebClient (lazy initialization)"""
+    from app.slack_utils import get_slack_client as get_shared_slack_client
+    return get_shared_slack_client()
+
+
+# Static Slack acknowledgement, encoded once
+_OK_BYTES = dumps({"ok": True})
+
+def ok_response() -> Response:
+    """Plain {"ok": true} acknowledgement for Slack interactions"""
+    return Response(content=_OK_BYTES, media_type="application/json")
+
+
+@lru_cache(maxsize=1)
+def help_response_bytes() -> bytes:
+    """/gtm-help reply, encoded once (the help text never changes)"""
+    from app.slack_handlers import handle_gtm_help
+    return dumps(handle_gtm_help())
+
+
+@lru_cache(maxsize=32)
+def unknown_command_bytes(command: str) -> bytes:
+    """Encoded reply for an unrecognised slash command"""
+    return dumps({
+        "response_type": "ephemeral",
+        "text": f"Unknown command: {command}. Try `/gtm-help` for available commands."
+    })
+
+
+def parse_form_body(body: bytes) -> dict:
+    """
+    Parse an application/x-www-form-urlencoded body into a flat dict.
+    Keeps only the first value for repeated keys, like Slack sends them.
+    """
+    return {key: values[0] for key, values in parse_qs(body.decode("utf-8"), keep_blank_values=True).items()}
+
+
+def open_update_modal(db: Session, text: str, trigger_id: Optional[str]) -> dict:
+    """
+    Handle /gtm-update command by opening the update modal for an activity.
+    Blocking (DB query and Slack views_open HTTP call) - run it in the threadpool.
+    """
+    if not text:
+        return {
+            "response_type": "ephemeral",
+            "text": "Please provide an activity ID. Example: `/gtm-update 1`"
+        }
+
+    try:
+        activity_id = int(text)
+        activity = crud.get_activity(db, activity_id)
+
+        if not activity:
+            return {
+                "response_type": "ephemeral",
+                "text": f"Activity #{activity_id} not found."
+            }
+
+        # Open modal
+        slack_client = get_slack_client()
+        if slack_client and trigger_id:
+            from app.slack_utils import create_update_modal
+            modal_view = create_update_modal(activity)
+            slack_client.views_open(trigger_id=trigger_id, view=modal_view)
+
+            return {
+                "response_type": "ephemeral",
+                "text": ""
+            }
+        else:
+            return {
+                "response_type": "ephemeral",
+                "text": "Slack client not configured or trigger_id missing"
+            }
+    except ValueError:
+        return {
+            "response_type": "ephemeral",
+            "text": f"Invalid activity ID: `{text}`. Please use a number."
+        }
+    except Exception as e:
+        return {
+            "response_type": "ephemeral",
+            "text": f"Error opening modal: {str(e)}"
+        }
+
+
+def respond_via_response_url(handler, text: str, response_url: str):
+    """
+    Run a slash command handler after the ack has been sent and post its
+    result to the command's response_url. Opens its own DB session since the
+    request-scoped one is closed by the time background tasks run.
+    """
+    db = get_session_local()()
+    try:
+        response = handler(db, text)
+    except Exception as e:
+        # The ack already went out, so report the failure to the user here
+        response = {
+            "response_type": "ephemeral",
+            "text": f"Error: {str(e)}"
+        }
+    finally:
+        db.close()
+
+    from app.slack_utils import post_to_response_url
+    post_to_response_url(response_url, response)
 
 
 @app.post("/api/slack/commands")
 async def slack_commands(
     request: Request,
-    command: str = Form(...),
-    text: str = Form(default=""),
-    user_id: str = Form(...),
-    response_url: str = Form(...),
-    trigger_id: str = Form(None),
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Handle Slack slash commands
     """
-    text = text.strip()
+    from app.slack_handlers import COMMAND_HANDLERS, DEFERRED_COMMANDS
+    from app.slack_utils import SLACK_AVAILABLE, is_slack_response_url, verify_slack_signature
+
+    # Verify against the raw body first, then parse it
+    await verify_slack_signature(request)
+    form_data = parse_form_body(await request.body())
+    command = form_data.get("command", "")
+    text = form_data.get("text", "").strip()
+    trigger_id = form_data.get("trigger_id")
+    response_url = form_data.get("response_url")
+
+    # DB-bound commands: ack with an empty 200 now, answer via response_url.
+    # Only Slack's own webhook URLs are posted to; anything else is answered inline.
+    if (command in DEFERRED_COMMANDS and SLACK_AVAILABLE
+            and response_url and is_slack_response_url(response_url)):
+        background_tasks.add_task(respond_via_response_url, COMMAND_HANDLERS[command], text, response_url)
+        return Response(status_code=200)
 
     # Route to appropriate handler
     if command == "/gtm-help":
-        response = handle_gtm_help()
-    elif command == "/gtm-list":
-        response = handle_gtm_list(db, text if text else None)
-    elif command == "/gtm-view":
-        response = handle_gtm_view(db, text)
-    elif command == "/gtm-add":
-        response = handle_gtm_add(db, text)
-    elif command == "/gtm-update":
+        return Response(content=help_response_bytes(), media_type="application/json")
+
+    if command == "/gtm-update":
         # For update, we need to open a modal
-        if not text:
-            return JSONResponse({
-                "response_type": "ephemeral",
-                "text": "Please provide an activity ID. Example: `/gtm-update 1`"
-            })
+        return ORJSONResponse(await run_in_threadpool(open_update_modal, db, text, trigger_id))
 
-        try:
-            activity_id = int(text)
-            activity = crud.get_activity(db, activity_id)
+    handler = COMMAND_HANDLERS.get(command)
+    if not handler:
+        return Response(content=unknown_command_bytes(command), media_type="application/json")
 
-            if not activity:
-                return JSONResponse({
-                    "response_type": "ephemeral",
-                    "text": f"Activity #{activity_id} not found."
-                })
+    return ORJSONResponse(await run_in_threadpool(handler, db, text))
 
-            # Open modal
-            if slack_client and trigger_id:
-                modal_view = create_update_modal(activity)
-                slack_client.views_open(trigger_id=trigger_id, view=modal_view)
 
-                return JSONResponse({
-                    "response_type": "ephemeral",
-                    "text": ""
-                })
-            else:
-                return JSONResponse({
-                    "response_type": "ephemeral",
-                    "text": "Slack client not configured or trigger_id missing"
-                })
-        except ValueError:
-            return JSONResponse({
-                "response_type": "ephemeral",
-                "text": f"Invalid activity ID: `{text}`. Please use a number."
-            })
-        except Exception as e:
-            return JSONResponse({
-                "response_type": "ephemeral",
-                "text": f"Error opening modal: {str(e)}"
-            })
+def view_activity_action(db: Session, activity_id: int, payload: dict) -> dict:
+    """View activity button"""
+    from app.slack_handlers import handle_gtm_view
+    return handle_gtm_view(db, str(activity_id))
+
+
+def edit_activity_action(db: Session, activity_id: int, payload: dict) -> dict:
+    """Edit activity button - opens the update modal (blocking, run in the threadpool)"""
+    activity = crud.get_activity(db, activity_id)
+
+    if not activity:
+        return {
+            "response_type": "ephemeral",
+            "text": f"Activity #{activity_id} not found."
+        }
+
+    # Open modal
+    slack_client = get_slack_client()
+    if slack_client:
+        from app.slack_utils import create_update_modal
+        trigger_id = payload.get("trigger_id")
+        modal_view = create_update_modal(activity)
+        slack_client.views_open(trigger_id=trigger_id, view=modal_view)
+
+    return {"ok": True}
+
+
+def delete_activity_action(db: Session, activity_id: int, payload: dict) -> dict:
+    """Delete activity button"""
+    deleted = crud.delete_activity(db, activity_id)
+
+    if deleted:
+        return {
+            "response_type": "ephemeral",
+            "text": f"✅ Activity #{activity_id} has been deleted.",
+            "replace_original": True
+        }
     else:
-        response = {
+        return {
             "response_type": "ephemeral",
-            "text": f"Unknown command: {command}. Try `/gtm-help` for available commands."
+            "text": f"❌ Activity #{activity_id} not found."
         }
 
-    return JSONResponse(response)
+
+# Button action_ids look like "<kind>_activity_<id>"; one match gives both parts
+ACTION_RE = re.compile(r"^(view|edit|delete)_activity_(\d+)$")
+
+# Button handlers keyed by action kind
+ACTION_HANDLERS = {
+    "view": view_activity_action,
+    "edit": edit_activity_action,
+    "delete": delete_activity_action,
+}
 
 
 @app.post("/api/slack/interactive")
@@ -283,10 +460,13 @@ async def slack_interactive(
     """
     Handle Slack interactive components (buttons, modals, etc.)
     """
-    # Parse form data
-    form_data = await request.form()
+    from app.slack_utils import parse_modal_submission, verify_slack_signature
+
+    # Verify against the raw body first, then parse it
+    await verify_slack_signature(request)
+    form_data = parse_form_body(await request.body())
     payload_str = form_data.get("payload", "{}")
-    payload = json.loads(payload_str)
+    payload = orjson.loads(payload_str)
 
     interaction_type = payload.get("type")
 
@@ -294,53 +474,14 @@ async def slack_interactive(
     if interaction_type == "block_actions":
         actions = payload.get("actions", [])
         if not actions:
-            return JSONResponse({"ok": True})
+            return ok_response()
 
         action = actions[0]
-        action_id = action.get("action_id", "")
-        value = action.get("value", "")
-
-        # View activity button
-        if action_id.startswith("view_activity_"):
-            activity_id = int(value)
-            response = handle_gtm_view(db, str(activity_id))
-            return JSONResponse(response)
-
-        # Edit activity button
-        elif action_id.startswith("edit_activity_"):
-            activity_id = int(value)
-            activity = crud.get_activity(db, activity_id)
-
-            if not activity:
-                return JSONResponse({
-                    "response_type": "ephemeral",
-                    "text": f"Activity #{activity_id} not found."
-                })
-
-            # Open modal
-            if slack_client:
-                trigger_id = payload.get("trigger_id")
-                modal_view = create_update_modal(activity)
-                slack_client.views_open(trigger_id=trigger_id, view=modal_view)
-
-            return JSONResponse({"ok": True})
-
-        # Delete activity button
-        elif action_id.startswith("delete_activity_"):
-            activity_id = int(value)
-            deleted = crud.delete_activity(db, activity_id)
+        match = ACTION_RE.match(action.get("action_id", ""))
 
-            if deleted:
-                return JSONResponse({
-                    "response_type": "ephemeral",
-                    "text": f"✅ Activity #{activity_id} has been deleted.",
-                    "replace_original": True
-                })
-            else:
-                return JSONResponse({
-                    "response_type": "ephemeral",
-                    "text": f"❌ Activity #{activity_id} not found."
-                })
+        if match:
+            kind, activity_id = match.group(1), int(match.group(2))
+            return ORJSONResponse(await run_in_threadpool(ACTION_HANDLERS[kind], db, activity_id, payload))
 
     # Handle modal submissions
     elif interaction_type == "view_submission":
@@ -355,24 +496,26 @@ async def slack_interactive(
 
             # Update activity
             activity_update = ActivityUpdate(**form_data)
-            updated_activity = crud.update_activity(db, activity_id, activity_update, partial=True)
+            updated_activity = await run_in_threadpool(
+                crud.update_activity, db, activity_id, activity_update, partial=True
+            )
 
             if updated_activity:
                 # Send confirmation message
                 response_url = payload.get("response_url")
-                return JSONResponse({
+                return ORJSONResponse({
                     "response_action": "clear",
                     "text": f"✅ Activity #{activity_id} updated successfully!"
                 })
             else:
-                return JSONResponse({
+                return ORJSONResponse({
                     "response_action": "errors",
                     "errors": {
                         "hypothesis": f"Activity #{activity_id} not found"
                     }
                 })
 
-    return JSONResponse({"ok": True})
+    return ok_response()
 
 
 # Events endpoint removed - not needed for slash commands
@@ -1,30 +1,85 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from app.models import GTMActivity
 from app.schemas import ActivityCreate, ActivityUpdate
 
+# Rows fetched per round-trip when streaming activities
+STREAM_BATCH_SIZE = 500
+
 def get_activities(
     db: Session,
     skip: int = 0,
     limit: int = 100,
     hypothesis: Optional[str] = None,
     audience: Optional[str] = None,
-    channels: Optional[str] = None
+    channels: Optional[str] = None,
+    newest_first: bool = False
 ) -> List[GTMActivity]:
     """
     Get list of activities with optional filters.
+    Ordered by id, ascending unless newest_first is set.
+    """
+    query = _filter_activities(db.query(GTMActivity), hypothesis, audience, channels)
+    # Order by primary key so pages are stable and LIMIT can stop early on the index
+    order = GTMActivity.id.desc() if newest_first else GTMActivity.id
+    return query.order_by(order).offset(skip).limit(limit).all()
+
+def get_activities_with_count(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    hypothesis: Optional[str] = None,
+    audience: Optional[str] = None,
+    channels: Optional[str] = None
+) -> Tuple[List[GTMActivity], int]:
+    """
+    Get a page of activities plus the total number of matching rows.
+    Uses COUNT(*) OVER() so both come back in a single round-trip.
     """
-    query = db.query(GTMActivity)
+    query = db.query(GTMActivity, func.count().over().label("total"))
+    query = _filter_activities(query, hypothesis, audience, channels)
+    rows = query.order_by(GTMActivity.id).offset(skip).limit(limit).all()
+
+    if rows:
+        return [activity for activity, _ in rows], rows[0].total
 
-    # Apply filters if provided
+    # Page is past the end (or nothing matched) - fall back to a plain count
+    total = _filter_activities(db.query(GTMActivity), hypothesis, audience, channels).count()
+    return [], total
+
+def _filter_activities(query, hypothesis: Optional[str], audience: Optional[str], channels: Optional[str]):
+    """
+    Apply the case-insensitive partial-match filters to an activities query.
+    """
     if hypothesis:
         query = query.filter(GTMActivity.hypothesis.ilike(f"%{hypothesis}%"))
     if audience:
         query = query.filter(GTMActivity.audience.ilike(f"%{audience}%"))
     if channels:
         query = query.filter(GTMActivity.channels.ilike(f"%{channels}%"))
+    return query
+
+def iter_activity_rows(
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = None,
+    hypothesis: Optional[str] = None,
+    audience: Optional[str] = None,
+    channels: Optional[str] = None
+) -> Iterator[dict]:
+    """
+    Iterate over activities as plain column dicts, fetched in batches.
+    Skips building ORM objects so large exports use constant memory.
+    """
+    query = _filter_activities(select(*GTMActivity.__table__.columns), hypothesis, audience, channels)
+    query = query.order_by(GTMActivity.id).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
 
-    return query.offset(skip).limit(limit).all()
+    result = db.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+    for row in result.mappings():
+        yield dict(row)
 
 def get_activity(db: Session, activity_id: int) -> Optional[GTMActivity]:
     """
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
@@ -25,6 +25,26 @@ def get_database_url():
 
     return url
 
+def get_pool_options():
+    """
+    Get connection pool settings from environment variables.
+
+    By default the engine keeps a QueuePool of warm connections so requests
+    don't pay a new TCP+TLS handshake each time. Set DB_USE_NULLPOOL=1 when
+    running on serverless (Vercel) behind PgBouncer in transaction mode, where
+    the pooler owns the connections and per-invocation pooling is pointless.
+    """
+    if os.getenv("DB_USE_NULLPOOL", "").lower() in ("1", "true", "yes"):
+        return {"poolclass": NullPool}
+
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": True
+    }
+
 def get_engine():
     """Get or create database engine (lazy initialization)"""
     global _engine
@@ -34,8 +54,8 @@ def get_engine():
             raise ValueError("No database URL configured")
         _engine = create_engine(
             db_url,
-            poolclass=NullPool,
-            echo=False
+            echo=False,
+            **get_pool_options()
         )
     return _engine
 
@@ -60,7 +80,24 @@ def get_db():
 
 def init_db():
     """
-    Initialize database - create all tables.
+    Initialize database - create all tables and indexes.
+
+    On PostgreSQL this also enables pg_trgm, which backs the trigram indexes
+    used by the ILIKE filters. Indexes are created with checkfirst so they are
+    added to tables that already exist. On a large, live table run
+    migrations/001_activity_trgm_indexes.sql instead, which uses CREATE INDEX
+    CONCURRENTLY to avoid locking writes, and use pg_stat_statements to
+    confirm which filter queries are worth indexing.
     """
     engine = get_engine()
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
     Base.metadata.create_all(bind=engine)
+
+    # create_all skips indexes on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
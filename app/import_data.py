@@ -4,26 +4,41 @@ Import GTM experiments data from CSV and markdown files
 import csv
 import os
 import re
-import glob
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from app.storage import storage
 
+# Notion export filenames: "hypothesis NOTION_ID.md" (32 hex chars)
+_MD_RE = re.compile(r'^(.+?)\s+[0-9a-f]{32}\.md$')
+
+
+_DATE_FORMATS = (
+    "%B %d, %Y",  # December 19, 2025
+    "%Y-%m-%d",   # 2025-12-19
+    "%m/%d/%Y",   # 12/19/2025
+)
+
 
 def parse_date(date_str):
     """Parse various date formats"""
     if not date_str or not date_str.strip():
         return None
 
-    date_str = date_str.strip()
+    return _parse_date_cached(date_str.strip())
 
-    # Try different formats
-    formats = [
-        "%B %d, %Y",  # December 19, 2025
-        "%Y-%m-%d",   # 2025-12-19
-        "%m/%d/%Y",   # 12/19/2025
-    ]
 
-    for fmt in formats:
+@lru_cache(maxsize=1024)
+def _parse_date_cached(date_str):
+    # Exports repeat the same handful of dates across rows, so memoize.
+    # Plain YYYY-MM-DD is already canonical; date.fromisoformat checks it
+    # far more cheaply than strptime.
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            return date.fromisoformat(date_str).isoformat()
+        except ValueError:
+            pass
+
+    for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
         except ValueError:
@@ -32,63 +47,106 @@ def parse_date(date_str):
     return date_str  # Return as-is if can't parse
 
 
+def _parse_count(value):
+    """Parse an integer cell, or None if blank or not a number"""
+    if not value:
+        return None
+    if value.isdecimal():
+        return int(value)
+
+    # Text like "N/A" or "TBD" can't be an int; skip it without raising
+    if value[0] not in '+-' and not value[0].isdecimal():
+        return None
+
+    # Rare: signed values or digit separators
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
 def find_md_file_for_hypothesis(hypothesis, data_dir='data'):
     """Find the markdown file for a given hypothesis"""
     if not hypothesis:
         return None
 
-    # Clean hypothesis for filename matching
-    hypothesis_clean = hypothesis.strip()
+    return _index_md_files(data_dir).get(hypothesis.strip())
+
+
+def hypothesis_from_md_filename(basename):
+    """Extract the hypothesis from a Notion export filename, or None"""
+    # Shortest possible match is "x <32 hex>.md"; reject others without the regex
+    if len(basename) < 37 or not basename.endswith('.md'):
+        return None
 
-    # Find all .md files
-    md_files = glob.glob(os.path.join(data_dir, '*.md'))
+    # Everything before the Notion ID is the hypothesis
+    match = _MD_RE.match(basename)
+    return match.group(1).strip() if match else None
 
-    for md_file in md_files:
-        basename = os.path.basename(md_file)
-        # Extract hypothesis from filename (everything before the Notion ID)
-        # Format: "hypothesis NOTION_ID.md"
-        match = re.match(r'^(.+?)\s+([0-9a-f]{32})\.md$', basename)
-        if match:
-            file_hypothesis = match.group(1).strip()
-            if file_hypothesis == hypothesis_clean:
-                return md_file
 
-    return None
+def _index_md_files(data_dir='data'):
+    """
+    Map hypothesis -> markdown file path for every Notion export in data_dir.
+    Hidden files are skipped, as glob's '*' would.
+    """
+    index = {}
+    try:
+        with os.scandir(data_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.name.endswith('.md'):
+                    continue
+                file_hypothesis = hypothesis_from_md_filename(entry.name)
+                if file_hypothesis is not None:
+                    # Keep the first match
+                    index.setdefault(file_hypothesis, entry.path)
+    except FileNotFoundError:
+        pass
+    return index
 
 
 def read_md_content(md_file):
     """Read additional content from markdown file"""
-    if not md_file or not os.path.exists(md_file):
+    if not md_file:
         return None
 
     try:
-        with open(md_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
+        with open(md_file, 'r', encoding='utf-8', buffering=1 << 17) as f:
             # Extract everything after the structured metadata
             # Look for sections like "Copy:" or additional paragraphs
-            lines = content.split('\n')
-
-            # Skip the header and metadata lines
             additional_content = []
             in_additional = False
 
-            for line in lines:
-                # Start collecting after metadata
-                if line.strip() and not line.startswith('#') and not ':' in line[:30]:
+            for line in f:
+                # Start collecting after metadata; once started, keep every line
+                if not in_additional:
+                    if not line.strip() or line.startswith('#') or line.find(':', 0, 30) != -1:
+                        continue
                     in_additional = True
 
-                if in_additional:
-                    additional_content.append(line)
+                additional_content.append(line)
 
-            result = '\n'.join(additional_content).strip()
+            result = ''.join(additional_content).strip()
             return result if result else None
 
+    except FileNotFoundError:
+        return None
     except Exception as e:
         print(f"Error reading {md_file}: {e}")
         return None
 
 
+_CSV_COLUMNS = (
+    'Hypothesis',
+    'Audience',
+    'Channels',
+    'Description/Activities',
+    'List size',
+    'Meetings booked',
+    'T1 Date or Start',
+    'End Date',
+)
+
+
 def import_csv_data(csv_path='data/table.csv', data_dir='data'):
     """Import GTM experiments from CSV and markdown files"""
 
@@ -96,61 +154,63 @@ def import_csv_data(csv_path='data/table.csv', data_dir='data'):
         print(f"CSV file not found: {csv_path}")
         return 0
 
-    imported = 0
+    batch = []
+
+    # Scan the markdown files once instead of once per row
+    md_index = _index_md_files(data_dir)
+
+    with open(csv_path, 'r', encoding='utf-8-sig', buffering=1 << 20) as f:
+        reader = csv.reader(f)
 
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
+        # Resolve column positions from the header once; missing columns read as ''
+        header = {name: i for i, name in enumerate(next(reader, []))}
+        positions = [header.get(name) for name in _CSV_COLUMNS]
 
         for row in reader:
-            hypothesis = row.get('Hypothesis', '').strip()
+            width = len(row)
+            (hypothesis, audience, channels, csv_description,
+             list_size_str, meetings_str, start_str, end_str) = [
+                row[i].strip() if i is not None and i < width else ''
+                for i in positions
+            ]
 
             if not hypothesis:
                 continue  # Skip empty rows
 
             # Find corresponding .md file
-            md_file = find_md_file_for_hypothesis(hypothesis, data_dir)
+            md_file = md_index.get(hypothesis)
             additional_content = read_md_content(md_file) if md_file else None
 
             # Combine description from CSV and additional content
             description_parts = []
-            if row.get('Description/Activities'):
-                description_parts.append(row['Description/Activities'].strip())
+            if csv_description:
+                description_parts.append(csv_description)
             if additional_content:
                 description_parts.append(additional_content)
 
             description = '\n\n'.join(description_parts) if description_parts else None
 
             # Parse numeric fields
-            list_size = None
-            try:
-                if row.get('List size') and row['List size'].strip():
-                    list_size = int(row['List size'].strip())
-            except ValueError:
-                pass
-
-            meetings_booked = None
-            try:
-                if row.get('Meetings booked') and row['Meetings booked'].strip():
-                    meetings_booked = int(row['Meetings booked'].strip())
-            except ValueError:
-                pass
-
-            # Create activity
-            activity = storage.create(
-                hypothesis=hypothesis,
-                audience=row.get('Audience', '').strip() or None,
-                channels=row.get('Channels', '').strip() or None,
-                description=description,
-                list_size=list_size,
-                meetings_booked=meetings_booked,
-                start_date=parse_date(row.get('T1 Date or Start', '')),
-                end_date=parse_date(row.get('End Date', ''))
-            )
-
-            imported += 1
-            print(f"Imported: #{activity.id} - {hypothesis[:50]}...")
-
-    return imported
+            list_size = _parse_count(list_size_str)
+            meetings_booked = _parse_count(meetings_str)
+
+            # Collect activity for a single bulk create
+            batch.append({
+                'hypothesis': hypothesis,
+                'audience': audience or None,
+                'channels': channels or None,
+                'description': description,
+                'list_size': list_size,
+                'meetings_booked': meetings_booked,
+                'start_date': parse_date(start_str),
+                'end_date': parse_date(end_str)
+            })
+
+            if len(batch) % 500 == 0:
+                print(f"Parsed {len(batch)} rows...")
+
+    activities = storage.bulk_create(batch)
+    return len(activities)
 
 
 if __name__ == '__main__':
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime
+from sqlalchemy import Column, Integer, String, Text, Float, Date, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -7,6 +7,24 @@ class GTMActivity(Base):
     SQLAlchemy model for GTM activities.
     """
     __tablename__ = "gtm_activities"
+    __table_args__ = (
+        # Trigram GIN indexes so the ILIKE '%term%' filters in
+        # crud.get_activities can use an index instead of a sequential scan.
+        # Requires the pg_trgm extension (created in init_db; existing
+        # databases: migrations/001_activity_trgm_indexes.sql).
+        Index(
+            "idx_activity_hypothesis_trgm", "hypothesis",
+            postgresql_using="gin", postgresql_ops={"hypothesis": "gin_trgm_ops"}
+        ),
+        Index(
+            "idx_activity_audience_trgm", "audience",
+            postgresql_using="gin", postgresql_ops={"audience": "gin_trgm_ops"}
+        ),
+        Index(
+            "idx_activity_channels_trgm", "channels",
+            postgresql_using="gin", postgresql_ops={"channels": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     hypothesis = Column(String, nullable=False)
@@ -15,11 +33,15 @@ class GTMActivity(Base):
     description = Column(Text, nullable=True)
     list_size = Column(Integer, nullable=True)
     meetings_booked = Column(Integer, nullable=True)
-    start_date = Column(Date, nullable=True)
+    start_date = Column(Date, nullable=True, index=True)
     end_date = Column(Date, nullable=True)
     est_weekly_hrs = Column(Float, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    def to_dict(self) -> dict:
+        """Convert to a dict of column values"""
+        return {column.key: getattr(self, column.key) for column in self.__table__.columns}
+
     def __repr__(self):
         return f"<GTMActivity(id={self.id}, hypothesis='{self.hypothesis}')>"
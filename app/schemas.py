@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 
 class ActivityBase(BaseModel):
@@ -37,3 +37,8 @@ class ActivityResponse(ActivityBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class ActivityListResponse(BaseModel):
+    """Schema for paginated list responses with a total count"""
+    items: List[ActivityResponse]
+    total: int
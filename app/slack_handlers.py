@@ -4,15 +4,10 @@ Slack command handlers for GTM Tracker
 from typing import Dict, Any
 from sqlalchemy.orm import Session
 from app import crud
-from app.schemas import ActivityCreate, ActivityUpdate
+from app.schemas import ActivityCreate
 
 
-def handle_gtm_help() -> Dict[str, Any]:
-    """
-    Handle /gtm-help command
-    Returns help text with available commands
-    """
-    help_text = """
+_HELP_TEXT = """
 *GTM Tracker Commands*
 
 • `/gtm-list [filter]` - List recent GTM activities
@@ -34,10 +29,46 @@ def handle_gtm_help() -> Dict[str, Any]:
 • Leave fields blank by using empty pipes: `hypothesis | | channels`
 • Filter the list by including text after `/gtm-list`
 """
-    return {
-        "response_type": "ephemeral",
-        "text": help_text
-    }
+
+# Shared, read-only response. Callers serialize it and must not mutate it.
+_HELP_RESPONSE = {
+    "response_type": "ephemeral",
+    "text": _HELP_TEXT
+}
+
+# Shared block and text objects; Slack only reads them
+_DIVIDER = {"type": "divider"}
+
+# Static pieces of the activity list, detail and create responses
+_VIEW_BUTTON_TEXT = {"type": "plain_text", "text": "View Details"}
+_EDIT_BUTTON_TEXT = {"type": "plain_text", "text": "Edit"}
+_DELETE_BUTTON_TEXT = {"type": "plain_text", "text": "Delete"}
+_DELETE_CONFIRM_TITLE = {"type": "plain_text", "text": "Are you sure?"}
+_DELETE_CONFIRM_OK = {"type": "plain_text", "text": "Delete"}
+_DELETE_CONFIRM_DENY = {"type": "plain_text", "text": "Cancel"}
+
+
+def _ephemeral(text: str = None, blocks: list = None) -> Dict[str, Any]:
+    """Build a response only visible to the user who ran the command"""
+    response = {"response_type": "ephemeral"}
+    if text is not None:
+        response["text"] = text
+    if blocks is not None:
+        response["blocks"] = blocks
+    return response
+
+
+def _md(text: str) -> Dict[str, str]:
+    """Build a mrkdwn text object"""
+    return {"type": "mrkdwn", "text": text}
+
+
+def handle_gtm_help() -> Dict[str, Any]:
+    """
+    Handle /gtm-help command
+    Returns help text with available commands
+    """
+    return _HELP_RESPONSE
 
 
 def handle_gtm_list(db: Session, filter_text: str = None) -> Dict[str, Any]:
@@ -50,25 +81,20 @@ def handle_gtm_list(db: Session, filter_text: str = None) -> Dict[str, Any]:
         db,
         skip=0,
         limit=10,
-        hypothesis=filter_text if filter_text else None
+        hypothesis=filter_text if filter_text else None,
+        newest_first=True
     )
 
     if not activities:
-        return {
-            "response_type": "ephemeral",
-            "text": "No activities found." + (f" (filtered by: {filter_text})" if filter_text else "")
-        }
+        return _ephemeral("No activities found." + (f" (filtered by: {filter_text})" if filter_text else ""))
 
     # Build response blocks
     blocks = [
         {
             "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*Recent GTM Activities* {f'(filtered by: {filter_text})' if filter_text else ''}"
-            }
+            "text": _md(f"*Recent GTM Activities* {f'(filtered by: {filter_text})' if filter_text else ''}")
         },
-        {"type": "divider"}
+        _DIVIDER
     ]
 
     for activity in activities:
@@ -86,25 +112,16 @@ def handle_gtm_list(db: Session, filter_text: str = None) -> Dict[str, Any]:
 
         blocks.append({
             "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": activity_text
-            },
+            "text": _md(activity_text),
             "accessory": {
                 "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "View Details"
-                },
+                "text": _VIEW_BUTTON_TEXT,
                 "value": str(activity.id),
                 "action_id": f"view_activity_{activity.id}"
             }
         })
 
-    return {
-        "response_type": "ephemeral",
-        "blocks": blocks
-    }
+    return _ephemeral(blocks=blocks)
 
 
 def handle_gtm_view(db: Session, activity_id: str) -> Dict[str, Any]:
@@ -113,44 +130,34 @@ def handle_gtm_view(db: Session, activity_id: str) -> Dict[str, Any]:
     Shows detailed view of a specific activity
     """
     if not activity_id:
-        return {
-            "response_type": "ephemeral",
-            "text": "Please provide an activity ID. Example: `/gtm-view 1`"
-        }
+        return _ephemeral("Please provide an activity ID. Example: `/gtm-view 1`")
 
     try:
         activity_id_int = int(activity_id)
     except ValueError:
-        return {
-            "response_type": "ephemeral",
-            "text": f"Invalid activity ID: `{activity_id}`. Please use a number."
-        }
+        return _ephemeral(f"Invalid activity ID: `{activity_id}`. Please use a number.")
 
     activity = crud.get_activity(db, activity_id_int)
 
     if not activity:
-        return {
-            "response_type": "ephemeral",
-            "text": f"Activity #{activity_id} not found."
-        }
+        return _ephemeral(f"Activity #{activity_id} not found.")
 
+    return _build_view_response(activity)
+
+
+def _build_view_response(activity) -> Dict[str, Any]:
+    """Build the detailed view blocks for an activity"""
     # Build detailed view
     blocks = [
         {
             "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*Activity #{activity.id}*"
-            }
+            "text": _md(f"*Activity #{activity.id}*")
         },
-        {"type": "divider"},
+        _DIVIDER,
         {
             "type": "section",
             "fields": [
-                {
-                    "type": "mrkdwn",
-                    "text": f"*Hypothesis:*\n{activity.hypothesis}"
-                }
+                _md(f"*Hypothesis:*\n{activity.hypothesis}")
             ]
         }
     ]
@@ -158,19 +165,19 @@ def handle_gtm_view(db: Session, activity_id: str) -> Dict[str, Any]:
     # Add optional fields
     fields = []
     if activity.audience:
-        fields.append({"type": "mrkdwn", "text": f"*Audience:*\n{activity.audience}"})
+        fields.append(_md(f"*Audience:*\n{activity.audience}"))
     if activity.channels:
-        fields.append({"type": "mrkdwn", "text": f"*Channels:*\n{activity.channels}"})
+        fields.append(_md(f"*Channels:*\n{activity.channels}"))
     if activity.list_size:
-        fields.append({"type": "mrkdwn", "text": f"*List Size:*\n{activity.list_size}"})
+        fields.append(_md(f"*List Size:*\n{activity.list_size}"))
     if activity.meetings_booked:
-        fields.append({"type": "mrkdwn", "text": f"*Meetings Booked:*\n{activity.meetings_booked}"})
+        fields.append(_md(f"*Meetings Booked:*\n{activity.meetings_booked}"))
     if activity.start_date:
-        fields.append({"type": "mrkdwn", "text": f"*Start Date:*\n{activity.start_date}"})
+        fields.append(_md(f"*Start Date:*\n{activity.start_date}"))
     if activity.end_date:
-        fields.append({"type": "mrkdwn", "text": f"*End Date:*\n{activity.end_date}"})
+        fields.append(_md(f"*End Date:*\n{activity.end_date}"))
     if activity.est_weekly_hrs:
-        fields.append({"type": "mrkdwn", "text": f"*Est Weekly Hours:*\n{activity.est_weekly_hrs}"})
+        fields.append(_md(f"*Est Weekly Hours:*\n{activity.est_weekly_hrs}"))
 
     if fields:
         blocks.append({
@@ -181,62 +188,38 @@ def handle_gtm_view(db: Session, activity_id: str) -> Dict[str, Any]:
     if activity.description:
         blocks.append({
             "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*Description:*\n{activity.description}"
-            }
+            "text": _md(f"*Description:*\n{activity.description}")
         })
 
     # Add action buttons
-    blocks.append({"type": "divider"})
+    blocks.append(_DIVIDER)
     blocks.append({
         "type": "actions",
         "elements": [
             {
                 "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Edit"
-                },
+                "text": _EDIT_BUTTON_TEXT,
                 "style": "primary",
                 "value": str(activity.id),
                 "action_id": f"edit_activity_{activity.id}"
             },
             {
                 "type": "button",
-                "text": {
-                    "type": "plain_text",
-                    "text": "Delete"
-                },
+                "text": _DELETE_BUTTON_TEXT,
                 "style": "danger",
                 "value": str(activity.id),
                 "action_id": f"delete_activity_{activity.id}",
                 "confirm": {
-                    "title": {
-                        "type": "plain_text",
-                        "text": "Are you sure?"
-                    },
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"This will permanently delete activity #{activity.id}"
-                    },
-                    "confirm": {
-                        "type": "plain_text",
-                        "text": "Delete"
-                    },
-                    "deny": {
-                        "type": "plain_text",
-                        "text": "Cancel"
-                    }
+                    "title": _DELETE_CONFIRM_TITLE,
+                    "text": _md(f"This will permanently delete activity #{activity.id}"),
+                    "confirm": _DELETE_CONFIRM_OK,
+                    "deny": _DELETE_CONFIRM_DENY
                 }
             }
         ]
     })
 
-    return {
-        "response_type": "ephemeral",
-        "blocks": blocks
-    }
+    return _ephemeral(blocks=blocks)
 
 
 def handle_gtm_add(db: Session, text: str) -> Dict[str, Any]:
@@ -245,29 +228,21 @@ def handle_gtm_add(db: Session, text: str) -> Dict[str, Any]:
     Quick add format: hypothesis | audience | channels
     """
     if not text or text.strip() == "":
-        return {
-            "response_type": "ephemeral",
-            "text": "Please provide activity details.\nFormat: `hypothesis | audience | channels`\nExample: `/gtm-add API is useful | Construction Software | Cold Email`"
-        }
+        return _ephemeral("Please provide activity details.\nFormat: `hypothesis | audience | channels`\nExample: `/gtm-add API is useful | Construction Software | Cold Email`")
 
-    # Parse input
-    parts = [p.strip() for p in text.split("|")]
+    # Parse input. Only the first three fields are used, so stop splitting
+    # after the third pipe; anything beyond it is dropped as before.
+    parts = [p.strip() for p in text.split("|", 3)[:3]]
 
     if len(parts) < 1:
-        return {
-            "response_type": "ephemeral",
-            "text": "Invalid format. Please use: `hypothesis | audience | channels`"
-        }
+        return _ephemeral("Invalid format. Please use: `hypothesis | audience | channels`")
 
     hypothesis = parts[0] if parts[0] else None
     audience = parts[1] if len(parts) > 1 and parts[1] else None
     channels = parts[2] if len(parts) > 2 and parts[2] else None
 
     if not hypothesis:
-        return {
-            "response_type": "ephemeral",
-            "text": "Hypothesis is required. Example: `/gtm-add API is useful | Construction Software | Cold Email`"
-        }
+        return _ephemeral("Hypothesis is required. Example: `/gtm-add API is useful | Construction Software | Cold Email`")
 
     # Create activity
     try:
@@ -284,16 +259,13 @@ def handle_gtm_add(db: Session, text: str) -> Dict[str, Any]:
             "blocks": [
                 {
                     "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": f"✅ *Created Activity #{activity.id}*\n*Hypothesis:* {activity.hypothesis}"
-                    }
+                    "text": _md(f"✅ *Created Activity #{activity.id}*\n*Hypothesis:* {activity.hypothesis}")
                 },
                 {
                     "type": "section",
                     "fields": [
-                        {"type": "mrkdwn", "text": f"*Audience:*\n{audience or 'Not specified'}"},
-                        {"type": "mrkdwn", "text": f"*Channels:*\n{channels or 'Not specified'}"}
+                        _md(f"*Audience:*\n{audience or 'Not specified'}"),
+                        _md(f"*Channels:*\n{channels or 'Not specified'}")
                     ]
                 },
                 {
@@ -301,7 +273,7 @@ def handle_gtm_add(db: Session, text: str) -> Dict[str, Any]:
                     "elements": [
                         {
                             "type": "button",
-                            "text": {"type": "plain_text", "text": "View Details"},
+                            "text": _VIEW_BUTTON_TEXT,
                             "value": str(activity.id),
                             "action_id": f"view_activity_{activity.id}"
                         }
@@ -310,46 +282,20 @@ def handle_gtm_add(db: Session, text: str) -> Dict[str, Any]:
             ]
         }
     except Exception as e:
-        return {
-            "response_type": "ephemeral",
-            "text": f"Error creating activity: {str(e)}"
-        }
-
-
-def handle_gtm_update(db: Session, activity_id: str) -> Dict[str, Any]:
-    """
-    Handle /gtm-update command
-    Opens a modal for updating an activity
-    """
-    if not activity_id:
-        return {
-            "response_type": "ephemeral",
-            "text": "Please provide an activity ID. Example: `/gtm-update 1`"
-        }
-
-    try:
-        activity_id_int = int(activity_id)
-    except ValueError:
-        return {
-            "response_type": "ephemeral",
-            "text": f"Invalid activity ID: `{activity_id}`. Please use a number."
-        }
-
-    activity = crud.get_activity(db, activity_id_int)
-
-    if not activity:
-        return {
-            "response_type": "ephemeral",
-            "text": f"Activity #{activity_id} not found."
-        }
-
-    # Return a message that the modal should be triggered
-    # The actual modal will be opened by the Slack endpoint
-    return {
-        "response_type": "ephemeral",
-        "text": f"Opening update form for activity #{activity_id}...",
-        "metadata": {
-            "action": "open_update_modal",
-            "activity_id": activity_id_int
-        }
-    }
+        return _ephemeral(f"Error creating activity: {str(e)}")
+
+
+# Slash command handlers keyed by command name.
+# Each handler takes (db, text) and returns a Slack response dict.
+# /gtm-update is routed separately since it needs a trigger_id to open a modal.
+COMMAND_HANDLERS = {
+    "/gtm-help": lambda db, text: handle_gtm_help(),
+    "/gtm-list": lambda db, text: handle_gtm_list(db, text if text else None),
+    "/gtm-view": handle_gtm_view,
+    "/gtm-add": handle_gtm_add,
+}
+
+# Commands that hit the database. These are acknowledged right away and
+# answered later via the command's response_url, so Slack's 3 second
+# deadline never depends on query time.
+DEFERRED_COMMANDS = frozenset({"/gtm-list", "/gtm-view", "/gtm-add"})
@@ -3,18 +3,47 @@ Slack utility functions for GTM Tracker
 """
 import os
 import hmac
-import hashlib
 import time
+from functools import lru_cache
 from typing import Optional
+from urllib.parse import urlsplit
 from fastapi import Request, HTTPException
 
 try:
     from slack_sdk import WebClient
     from slack_sdk.errors import SlackApiError
+    from slack_sdk.webhook import WebhookClient
     SLACK_AVAILABLE = True
 except ImportError:
     SLACK_AVAILABLE = False
     WebClient = None
+    WebhookClient = None
+
+
+# Shared Slack client, created on first use
+_slack_client = None
+
+
+def get_slack_client() -> Optional[WebClient]:
+    """
+    Get the process-wide Slack WebClient, creating it on first use.
+    Returns None if slack_sdk isn't installed or SLACK_BOT_TOKEN isn't set.
+    """
+    global _slack_client
+    if _slack_client is None and SLACK_AVAILABLE:
+        slack_bot_token = os.getenv("SLACK_BOT_TOKEN")
+        if slack_bot_token:
+            _slack_client = WebClient(token=slack_bot_token)
+    return _slack_client
+
+
+@lru_cache(maxsize=1)
+def _get_hmac_template(signing_secret: str):
+    """
+    Build an HMAC-SHA256 object keyed with the signing secret.
+    Callers copy() it so the key setup only runs once per secret.
+    """
+    return hmac.new(signing_secret.encode(), digestmod="sha256")
 
 
 def verify_slack_request(request: Request, body: bytes, timestamp: str, signature: str) -> bool:
@@ -36,18 +65,22 @@ def verify_slack_request(request: Request, body: bytes, timestamp: str, signatur
         # If no signing secret is configured, skip verification (development mode)
         return True
 
-    # Check timestamp to prevent replay attacks (5 minutes)
-    current_time = int(time.time())
-    if abs(current_time - int(timestamp)) > 60 * 5:
+    # Check timestamp before doing any HMAC work, so replayed or
+    # garbage requests are rejected cheaply (5 minutes)
+    # Slack sends a plain Unix timestamp; anything else is rejected without
+    # raising (isdecimal accepts exactly the digits int() does)
+    if not timestamp.isdecimal():
+        return False
+    request_time = int(timestamp)
+
+    if abs(int(time.time()) - request_time) > 60 * 5:
         return False
 
-    # Compute signature
-    sig_basestring = f"v0:{timestamp}:{body.decode('utf-8')}"
-    my_signature = 'v0=' + hmac.new(
-        slack_signing_secret.encode(),
-        sig_basestring.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    # Compute signature from a copy of the pre-keyed HMAC
+    mac = _get_hmac_template(slack_signing_secret).copy()
+    mac.update(f"v0:{timestamp}:".encode())
+    mac.update(body)
+    my_signature = 'v0=' + mac.hexdigest()
 
     # Compare signatures
     return hmac.compare_digest(my_signature, signature)
@@ -57,7 +90,14 @@ async def verify_slack_signature(request: Request) -> bool:
     """
     Middleware-style verification of Slack request signature.
     Raises HTTPException if verification fails.
+
+    The raw body is read (and cached on the request) before anything parses
+    it, so the signature is always checked against the exact bytes Slack sent.
     """
+    if not os.getenv("SLACK_SIGNING_SECRET", ""):
+        # If no signing secret is configured, skip verification (development mode)
+        return True
+
     timestamp = request.headers.get("X-Slack-Request-Timestamp", "")
     signature = request.headers.get("X-Slack-Signature", "")
 
@@ -263,7 +303,7 @@ def post_new_activity_notification(activity, slack_client: Optional[WebClient] =
 
     Args:
         activity: GTMActivity model instance
-        slack_client: Slack WebClient instance (optional, will be created if not provided)
+        slack_client: Slack WebClient instance (optional, the shared client is used if not provided)
         channel: Slack channel to post to (defaults to env var SLACK_NOTIFICATION_CHANNEL or #all-set4)
 
     Returns:
@@ -272,12 +312,11 @@ def post_new_activity_notification(activity, slack_client: Optional[WebClient] =
     if not SLACK_AVAILABLE:
         return False
 
-    # Get or create Slack client
+    # Fall back to the shared Slack client
     if not slack_client:
-        slack_bot_token = os.getenv("SLACK_BOT_TOKEN")
-        if not slack_bot_token:
+        slack_client = get_slack_client()
+        if not slack_client:
             return False
-        slack_client = WebClient(token=slack_bot_token)
 
     # Get channel from parameter, environment, or default
     if not channel:
@@ -287,6 +326,9 @@ def post_new_activity_notification(activity, slack_client: Optional[WebClient] =
     if not channel.startswith("#"):
         channel = f"#{channel}"
 
+    # Share block literals with the command responses
+    from app.slack_handlers import _DIVIDER, _VIEW_BUTTON_TEXT
+
     try:
         # Build message blocks
         blocks = [
@@ -297,7 +339,7 @@ def post_new_activity_notification(activity, slack_client: Optional[WebClient] =
                     "text": "🚀 *New GTM Activity!*"
                 }
             },
-            {"type": "divider"},
+            _DIVIDER,
             {
                 "type": "section",
                 "text": {
@@ -310,7 +352,7 @@ def post_new_activity_notification(activity, slack_client: Optional[WebClient] =
                 "elements": [
                     {
                         "type": "button",
-                        "text": {"type": "plain_text", "text": "View Details"},
+                        "text": _VIEW_BUTTON_TEXT,
                         "value": str(activity.id),
                         "action_id": f"view_activity_{activity.id}"
                     }
@@ -334,3 +376,40 @@ def post_new_activity_notification(activity, slack_client: Optional[WebClient] =
     except Exception as e:
         print(f"Unexpected error posting to Slack: {str(e)}")
         return False
+
+
+def is_slack_response_url(response_url: str) -> bool:
+    """
+    Check that a response_url points at Slack's webhook host.
+    The URL comes from the request body, so anything else is never posted to.
+    """
+    try:
+        parts = urlsplit(response_url)
+    except ValueError:
+        return False
+    return parts.scheme == "https" and parts.netloc == "hooks.slack.com"
+
+
+def post_to_response_url(response_url: str, response: dict) -> bool:
+    """
+    Post a delayed slash command response to Slack's response_url.
+
+    Args:
+        response_url: response_url sent by Slack with the command
+        response: Slack message dict (response_type, text, blocks)
+
+    Returns:
+        True if Slack accepted the message, False otherwise
+    """
+    if not SLACK_AVAILABLE or not is_slack_response_url(response_url):
+        return False
+
+    try:
+        result = WebhookClient(response_url).send_dict(response)
+        if result.status_code != 200:
+            print(f"Error posting to Slack response_url: {result.status_code} {result.body}")
+            return False
+        return True
+    except Exception as e:
+        print(f"Unexpected error posting to Slack response_url: {str(e)}")
+        return False
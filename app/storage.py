@@ -2,9 +2,20 @@
 In-memory storage for GTM activities
 This will be replaced with PostgreSQL database later
 """
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional, Dict
-from dataclasses import dataclass, field, asdict
+from itertools import islice
+from typing import List, Optional, Dict, Set, Tuple
+from dataclasses import dataclass, field, fields
+
+# Fields searched by list_all's filter
+_SEARCH_FIELDS = ("hypothesis", "audience", "channels")
+
+
+def _trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
 
 @dataclass
 class GTMActivity:
@@ -24,18 +35,77 @@ class GTMActivity:
 
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        return asdict(self)
+        # Fields are all scalars, so skip asdict's recursive copy
+        return {name: getattr(self, name) for name in _ACTIVITY_FIELDS}
+
+
+_ACTIVITY_FIELDS = tuple(f.name for f in fields(GTMActivity))
 
 
 class InMemoryStorage:
     """Simple in-memory storage for activities"""
 
     def __init__(self):
+        # Ids only grow and are never reinserted, so insertion order is
+        # ascending id order and reversed() walks newest first
         self.activities: Dict[int, GTMActivity] = {}
         self.next_id = 1
+        # Trigram -> ids whose lowercased search fields contain it. Narrows
+        # substring filters to a few candidates before the exact check.
+        self._trigram_index: Dict[str, Set[int]] = defaultdict(set)
+        self._activity_trigrams: Dict[int, Set[str]] = {}
+        # Lowercased non-empty search fields per id, computed on write
+        self._blobs: Dict[int, Tuple[str, ...]] = {}
+
+    def _index(self, activity: GTMActivity) -> None:
+        """Record an activity's lowercased search fields and their trigrams"""
+        blobs = tuple(
+            value.lower() for value in (getattr(activity, name) for name in _SEARCH_FIELDS) if value
+        )
+        grams = set()
+        for blob in blobs:
+            grams |= _trigrams(blob)
+        self._blobs[activity.id] = blobs
+        self._activity_trigrams[activity.id] = grams
+        for gram in grams:
+            self._trigram_index[gram].add(activity.id)
+
+    def _unindex(self, activity_id: int) -> None:
+        """Drop an activity from the search structures"""
+        self._blobs.pop(activity_id, None)
+        for gram in self._activity_trigrams.pop(activity_id, ()):
+            postings = self._trigram_index[gram]
+            postings.discard(activity_id)
+            if not postings:
+                del self._trigram_index[gram]
+
+    def _candidate_ids(self, filter_lower: str):
+        """
+        Ids, newest first, that may match filter_lower. Every id
+        containing the filter as a substring is included; callers still
+        check the match itself.
+        """
+        grams = _trigrams(filter_lower)
+        if not grams:
+            # Too short to use the index
+            return reversed(self.activities)
+
+        postings = sorted((self._trigram_index.get(gram, ()) for gram in grams), key=len)
+        if not postings[0]:
+            return ()
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return ()
+        return sorted(candidates, reverse=True)
 
     def create(self, hypothesis: str, audience: str = None, channels: str = None, **kwargs) -> GTMActivity:
         """Create a new activity"""
+        # One timestamp for both fields instead of two default_factory calls
+        now = datetime.utcnow().isoformat()
+        kwargs.setdefault("created_at", now)
+        kwargs.setdefault("updated_at", now)
         activity = GTMActivity(
             id=self.next_id,
             hypothesis=hypothesis,
@@ -44,31 +114,42 @@ class InMemoryStorage:
             **kwargs
         )
         self.activities[self.next_id] = activity
+        self._index(activity)
         self.next_id += 1
         return activity
 
+    def bulk_create(self, rows: List[Dict]) -> List[GTMActivity]:
+        """Create several activities at once, one per field dict"""
+        activities = []
+        # The whole batch is created at the same instant
+        now = datetime.utcnow().isoformat()
+        for row in rows:
+            activity = GTMActivity(id=self.next_id, created_at=now, updated_at=now, **row)
+            self.activities[self.next_id] = activity
+            self._index(activity)
+            self.next_id += 1
+            activities.append(activity)
+        return activities
+
     def get(self, activity_id: int) -> Optional[GTMActivity]:
         """Get an activity by ID"""
         return self.activities.get(activity_id)
 
     def list_all(self, limit: int = 10, filter_text: str = None) -> List[GTMActivity]:
         """List all activities with optional filter"""
-        activities = list(self.activities.values())
+        if not filter_text:
+            # Newest first, touching only the activities returned
+            return list(islice(reversed(self.activities.values()), max(limit, 0)))
 
-        # Filter if text provided
-        if filter_text:
-            filter_lower = filter_text.lower()
-            activities = [
-                a for a in activities
-                if (a.hypothesis and filter_lower in a.hypothesis.lower()) or
-                   (a.audience and filter_lower in a.audience.lower()) or
-                   (a.channels and filter_lower in a.channels.lower())
-            ]
+        filter_lower = filter_text.lower()
+        results = []
+        for activity_id in self._candidate_ids(filter_lower):
+            if len(results) >= limit:
+                break
+            if any(filter_lower in blob for blob in self._blobs[activity_id]):
+                results.append(self.activities[activity_id])
 
-        # Sort by ID descending (newest first)
-        activities.sort(key=lambda x: x.id, reverse=True)
-
-        return activities[:limit]
+        return results
 
     def update(self, activity_id: int, **kwargs) -> Optional[GTMActivity]:
         """Update an activity"""
@@ -77,9 +158,15 @@ class InMemoryStorage:
             return None
 
         # Update fields
+        reindex = False
         for key, value in kwargs.items():
             if hasattr(activity, key) and value is not None:
                 setattr(activity, key, value)
+                reindex = reindex or key in _SEARCH_FIELDS
+
+        if reindex:
+            self._unindex(activity_id)
+            self._index(activity)
 
         activity.updated_at = datetime.utcnow().isoformat()
         return activity
@@ -88,6 +175,7 @@ class InMemoryStorage:
         """Delete an activity"""
         if activity_id in self.activities:
             del self.activities[activity_id]
+            self._unindex(activity_id)
             return True
         return False
 
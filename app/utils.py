@@ -1,9 +1,25 @@
 import csv
-from datetime import datetime
-from typing import Optional
+import io
+import math
+import re
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, List, Optional, Union
 from sqlalchemy.orm import Session
 from app.models import GTMActivity
 
+# Date formats tried by parse_date, in order
+DATE_FORMATS = (
+    "%Y-%m-%d",           # 2024-01-15
+    "%m/%d/%Y",           # 01/15/2024
+    "%d/%m/%Y",           # 15/01/2024
+    "%B %d, %Y",          # January 15, 2024
+    "%b %d, %Y",          # Jan 15, 2024
+    "%Y/%m/%d",           # 2024/01/15
+    "%d-%m-%Y",           # 15-01-2024
+)
+
 def parse_date(date_str: Optional[str]) -> Optional[datetime.date]:
     """
     Parse date string in various formats.
@@ -12,20 +28,19 @@ def parse_date(date_str: Optional[str]) -> Optional[datetime.date]:
     if not date_str or date_str.strip() == "":
         return None
 
-    date_str = date_str.strip()
+    return _parse_date_stripped(date_str.strip())
 
-    # Common date formats to try
-    date_formats = [
-        "%Y-%m-%d",           # 2024-01-15
-        "%m/%d/%Y",           # 01/15/2024
-        "%d/%m/%Y",           # 15/01/2024
-        "%B %d, %Y",          # January 15, 2024
-        "%b %d, %Y",          # Jan 15, 2024
-        "%Y/%m/%d",           # 2024/01/15
-        "%d-%m-%Y",           # 15-01-2024
-    ]
+@lru_cache(maxsize=4096)
+def _parse_date_stripped(date_str: str) -> Optional[datetime.date]:
+    """
+    Try each format in DATE_FORMATS. Memoized: CSV exports repeat the same
+    dates across rows, and the date objects returned are immutable.
+    """
+    parsed = _fast_ymd(date_str)
+    if parsed is not None:
+        return parsed
 
-    for fmt in date_formats:
+    for fmt in _candidate_date_formats(date_str):
         try:
             return datetime.strptime(date_str, fmt).date()
         except ValueError:
@@ -33,56 +48,251 @@ def parse_date(date_str: Optional[str]) -> Optional[datetime.date]:
 
     return None
 
-def parse_int(value: Optional[str]) -> Optional[int]:
+def _fast_ymd(date_str: str) -> Optional[datetime.date]:
+    """
+    Parse YYYY-MM-DD or YYYY/MM/DD by slicing, without strptime.
+    Returns None for anything else (including invalid dates) so the caller
+    falls back to the format list.
+    """
+    if len(date_str) != 10 or date_str[4] not in "-/" or date_str[7] != date_str[4]:
+        return None
+    year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+    if not (date_str.isascii() and year.isdigit() and month.isdigit() and day.isdigit()):
+        return None
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+# DATE_FORMATS narrowed by separator / leading character, keeping their order.
+# A format can only match strings containing its literal separator, so the
+# result is the same as trying the full list.
+_DASH_DATE_FORMATS = tuple(fmt for fmt in DATE_FORMATS if "-" in fmt)
+_SLASH_DATE_FORMATS = tuple(fmt for fmt in DATE_FORMATS if "/" in fmt)
+_NAMED_MONTH_DATE_FORMATS = tuple(fmt for fmt in DATE_FORMATS if fmt.startswith(("%B", "%b")))
+
+def _candidate_date_formats(date_str: str):
+    """
+    Pick the formats worth trying for date_str from its shape, so most
+    dates hit on the first strptime instead of raising through the list.
+    """
+    if "-" in date_str:
+        return _DASH_DATE_FORMATS
+    if "/" in date_str:
+        return _SLASH_DATE_FORMATS
+    if date_str[0].isalpha():
+        return _NAMED_MONTH_DATE_FORMATS
+    return DATE_FORMATS
+
+# Plain decimal numbers float() always accepts, so they skip the try below
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+def parse_int(value: Union[str, int, float, None]) -> Optional[int]:
     """
     Parse integer value, return None if empty or invalid.
+    Already-numeric values (e.g. pre-typed input) skip string parsing.
+    Finite floats are truncated, unlike "2.5" which is invalid; NaN,
+    infinite floats and bools become None, as their strings do.
     """
-    if not value or value.strip() == "":
+    if not isinstance(value, str):
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float) and math.isfinite(value):
+            return int(value)
+        return None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdecimal():
+        return int(value)
+    # Blank or text like "N/A" can't be an int; reject without raising
+    if not value or (value[0] not in "+-" and not value[0].isdecimal()):
         return None
+    # Rare: signed values or digit separators
     try:
-        return int(value.strip())
+        return int(value)
     except ValueError:
         return None
 
-def parse_float(value: Optional[str]) -> Optional[float]:
+def parse_float(value: Union[str, int, float, None]) -> Optional[float]:
     """
     Parse float value, return None if empty or invalid.
+    Already-numeric values skip string parsing and give the same result as
+    their string form: NaN and inf pass through, bools become None.
     """
-    if not value or value.strip() == "":
+    if not isinstance(value, str):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        return None
+    if not value:
+        return None
+    value = value.strip()
+    if _FLOAT_RE.fullmatch(value):
+        return float(value)
+    # Only signs, digits, "." or inf/nan spellings can start a float
+    if not value or (value[0] not in "+-.iInN" and not value[0].isdecimal()):
         return None
     try:
-        return float(value.strip())
+        return float(value)
     except ValueError:
         return None
 
+# Rows parsed, written and committed per batch by import_csv_to_db
+IMPORT_BATCH_SIZE = 1000
+
+# Columns loaded by import_csv_to_db, in COPY order
+IMPORT_COLUMNS = (
+    "hypothesis",
+    "audience",
+    "channels",
+    "description",
+    "list_size",
+    "meetings_booked",
+    "start_date",
+    "end_date",
+    "est_weekly_hrs",
+)
+
+# CSV header names accepted for each field, in order of preference.
+# Matched case-insensitively; covers Notion export names and field names.
+COLUMN_ALIASES = {
+    "hypothesis": ("hypothesis",),
+    "audience": ("audience",),
+    "channels": ("channels",),
+    "description": ("description/activities", "description"),
+    "list_size": ("list size", "list_size"),
+    "meetings_booked": ("meetings booked", "meetings_booked"),
+    "start_date": ("t1 date or start", "start date", "start_date"),
+    "end_date": ("end date", "end_date"),
+    "est_weekly_hrs": ("est weekly hrs", "est_weekly_hrs"),
+}
+
+def resolve_columns(header: List[str]) -> dict:
+    """
+    Map each field to the positions of its alias columns in the CSV header,
+    in alias order. Resolved once per file so rows are read by index.
+    """
+    names = [name.strip().lower() for name in header]
+    return {
+        field: tuple(i for alias in aliases for i, name in enumerate(names) if name == alias)
+        for field, aliases in COLUMN_ALIASES.items()
+    }
+
+def _cell(row: List[str], positions: tuple) -> str:
+    """First non-blank value among the given positions, stripped, or ''"""
+    for i in positions:
+        if i < len(row):
+            value = row[i].strip()
+            if value:
+                return value
+    return ""
+
+def make_row_converter(header: List[str], as_dict: bool = False) -> Callable[[List[str]], Union[tuple, dict]]:
+    """
+    Build a function mapping a CSV row (a csv.reader list) to activity field
+    values for this header: a tuple in IMPORT_COLUMNS order for COPY, or a
+    dict keyed by field name when as_dict is set (for Core inserts). Column
+    positions are resolved once and bound in the closure, so the per-row
+    work is just the cell reads and converters.
+    """
+    columns = resolve_columns(header)
+    (hypothesis, audience, channels, description, list_size,
+     meetings_booked, start_date, end_date, est_weekly_hrs) = (columns[field] for field in IMPORT_COLUMNS)
+
+    def convert(row: List[str]) -> tuple:
+        return (
+            _cell(row, hypothesis),
+            _cell(row, audience) or None,
+            _cell(row, channels) or None,
+            _cell(row, description) or None,
+            parse_int(_cell(row, list_size)),
+            parse_int(_cell(row, meetings_booked)),
+            parse_date(_cell(row, start_date)),
+            parse_date(_cell(row, end_date)),
+            parse_float(_cell(row, est_weekly_hrs))
+        )
+
+    def convert_to_dict(row: List[str]) -> dict:
+        return {
+            "hypothesis": _cell(row, hypothesis),
+            "audience": _cell(row, audience) or None,
+            "channels": _cell(row, channels) or None,
+            "description": _cell(row, description) or None,
+            "list_size": parse_int(_cell(row, list_size)),
+            "meetings_booked": parse_int(_cell(row, meetings_booked)),
+            "start_date": parse_date(_cell(row, start_date)),
+            "end_date": parse_date(_cell(row, end_date)),
+            "est_weekly_hrs": parse_float(_cell(row, est_weekly_hrs))
+        }
+
+    return convert_to_dict if as_dict else convert
+
+# FORCE_NOT_NULL keeps an empty hypothesis as '' (the column is NOT NULL)
+_COPY_SQL = (
+    f"COPY {GTMActivity.__tablename__} ({', '.join(IMPORT_COLUMNS)}) FROM STDIN "
+    f"WITH (FORMAT csv, FORCE_NOT_NULL (hypothesis))"
+)
+
+def copy_activities(db: Session, rows: List[tuple]) -> None:
+    """
+    Bulk load activity rows (tuples in IMPORT_COLUMNS order) with
+    PostgreSQL COPY FROM STDIN.
+    Runs on the session's connection, so it commits with the session.
+    """
+    buffer = io.StringIO()
+    # None becomes an unquoted empty field, which COPY reads as NULL
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(_COPY_SQL, buffer)
+    finally:
+        cursor.close()
+
 def import_csv_to_db(db: Session, csv_file_path: str) -> int:
     """
     Import activities from CSV file to database.
+    Rows are parsed and committed IMPORT_BATCH_SIZE at a time, so memory and
+    transaction size stay bounded. On PostgreSQL each batch is loaded with
+    COPY; other databases use executemany INSERTs. If a batch fails it is
+    rolled back and the error is raised; earlier batches stay committed.
     Returns number of activities imported.
     """
-    imported_count = 0
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    # Core executemany INSERT on the session's connection: no ORM objects,
+    # no ORM bulk-insert layer. Without RETURNING this is one single-row
+    # INSERT ... VALUES statement passed to the driver's cursor.executemany.
+    statement = GTMActivity.__table__.insert()
+    imported = 0
 
-    with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
+    with open(csv_file_path, 'r', encoding='utf-8-sig', newline='', buffering=1 << 20) as csvfile:
+        reader = csv.reader(csvfile)
+        # COPY takes tuples; the Core insert needs one mapping per row
+        convert = make_row_converter(next(reader, []), as_dict=not use_copy)
 
-        for row in reader:
-            # Map CSV columns to database fields
-            # Handle both CSV column names and database field names
-            activity = GTMActivity(
-                hypothesis=row.get('Hypothesis', '').strip() or row.get('hypothesis', '').strip(),
-                audience=row.get('Audience', '').strip() or row.get('audience', '').strip() or None,
-                channels=row.get('Channels', '').strip() or row.get('channels', '').strip() or None,
-                description=row.get('Description/Activities', '').strip() or row.get('Description', '').strip() or row.get('description', '').strip() or None,
-                list_size=parse_int(row.get('List size') or row.get('List Size') or row.get('list_size', '')),
-                meetings_booked=parse_int(row.get('Meetings booked') or row.get('Meetings Booked') or row.get('meetings_booked', '')),
-                start_date=parse_date(row.get('T1 Date or Start') or row.get('Start Date') or row.get('start_date', '')),
-                end_date=parse_date(row.get('End Date') or row.get('end_date', '')),
-                est_weekly_hrs=parse_float(row.get('Est weekly hrs') or row.get('Est Weekly Hrs') or row.get('est_weekly_hrs', ''))
-            )
+        while True:
+            batch = list(islice(reader, IMPORT_BATCH_SIZE))
+            if not batch:
+                break
 
-            db.add(activity)
-            imported_count += 1
+            # DictReader skipped blank lines; csv.reader yields them as []
+            rows = [convert(row) for row in batch if row]
+            if not rows:
+                continue
 
-        db.commit()
+            try:
+                if use_copy:
+                    copy_activities(db, rows)
+                else:
+                    # Fetched per batch: commit releases the session's connection
+                    db.connection().execute(statement, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            imported += len(rows)
 
-    return imported_count
+    return imported
@@ -0,0 +1,23 @@
+-- Trigram GIN indexes backing the ILIKE '%term%' filters on gtm_activities.
+--
+-- init_db creates these for new databases; run this file once against an
+-- existing database:
+--
+--     psql "$DATABASE_URL" -f migrations/001_activity_trgm_indexes.sql
+--
+-- CREATE EXTENSION needs a role allowed to create extensions in the database
+-- (the database owner on PostgreSQL 13+, where pg_trgm is a trusted
+-- extension; otherwise a superuser). CREATE INDEX CONCURRENTLY can't run
+-- inside a transaction, so don't wrap this file in BEGIN/COMMIT or run it
+-- with psql --single-transaction.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_hypothesis_trgm
+    ON gtm_activities USING gin (hypothesis gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_audience_trgm
+    ON gtm_activities USING gin (audience gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_activity_channels_trgm
+    ON gtm_activities USING gin (channels gin_trgm_ops);
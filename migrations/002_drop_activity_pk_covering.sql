@@ -0,0 +1,9 @@
+-- Drop the covering index on gtm_activities.id that earlier init_db runs
+-- created. No query reads only its included columns, so it never served an
+-- index-only scan and only added write cost on top of the primary key.
+--
+--     psql "$DATABASE_URL" -f migrations/002_drop_activity_pk_covering.sql
+--
+-- Like 001, run it outside a transaction (DROP INDEX CONCURRENTLY).
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_activity_pk_covering;